@@ -0,0 +1,215 @@
+import functools
+import gzip
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+
+# Cassette settings, read from the environment so the Streamlit app needs no code changes.
+# HEXORCIST_CASSETTE_MODE: "record", "replay" or empty (disabled).
+# HEXORCIST_REPLAY_SPEED: 1.0 replays at the recorded speed, 10 is ten times faster, 0 has no delay.
+CASSETTE_MODE = os.getenv("HEXORCIST_CASSETTE_MODE", "").lower()
+CASSETTE_PATH = os.getenv("HEXORCIST_CASSETTE_PATH", "hexorcist_cassette.jsonl.gz")
+REPLAY_SPEED = float(os.getenv("HEXORCIST_REPLAY_SPEED", "1.0"))
+
+_lock = threading.Lock()
+_replay_entries = None
+
+
+# Function to change the cassette settings at runtime, e.g. from a profiling script.
+def configure(mode=None, path=None, speed=None):
+    global CASSETTE_MODE, CASSETTE_PATH, REPLAY_SPEED, _replay_entries
+    with _lock:
+        if mode is not None:
+            CASSETTE_MODE = mode.lower()
+        if path is not None:
+            CASSETTE_PATH = path
+        if speed is not None:
+            REPLAY_SPEED = float(speed)
+        _replay_entries = None
+
+
+# Function to build the lookup key of a recorded call.
+def prompt_key(pipeline, prompt):
+    return hashlib.sha256(f"{pipeline}\0{prompt}".encode("utf-8")).hexdigest()[:16]
+
+
+# Function to read every entry of a cassette file.
+def load_cassette(path):
+    entries = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entries.append(json.loads(line))
+    return entries
+
+
+def _write_entry(entry):
+    # Each call appends a gzip member, so a crashed recording keeps everything before it.
+    line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n"
+    with _lock:
+        with gzip.open(CASSETTE_PATH, "at", encoding="utf-8") as f:
+            f.write(line)
+
+
+def _next_replay_entry(pipeline, prompt):
+    global _replay_entries
+    with _lock:
+        if _replay_entries is None:
+            # Only cache a fully loaded cassette, so a missing file keeps raising its real error.
+            entries = defaultdict(deque)
+            for entry in load_cassette(CASSETTE_PATH):
+                entries[entry["key"]].append(entry)
+            _replay_entries = entries
+
+        queue = _replay_entries.get(prompt_key(pipeline, prompt))
+        if not queue:
+            raise KeyError(f"No recorded {pipeline} response for this prompt in {CASSETTE_PATH}")
+        # Identical prompts are served in recording order; the last one is reused for extra calls.
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+
+def _replay_stream(entry):
+    # Replay each chunk after the provider time recorded for it; the first delay is the time to first token.
+    chunk_delays = entry.get("chunk_delays") or [entry["elapsed"] / max(len(entry["chunks"]), 1)] * len(entry["chunks"])
+    for chunk, delay in zip(entry["chunks"], chunk_delays):
+        if REPLAY_SPEED > 0:
+            time.sleep(delay / REPLAY_SPEED)
+        yield chunk
+    if "error" in entry:
+        raise RuntimeError(entry["error"])
+
+
+def _replay(pipeline, prompt):
+    entry = _next_replay_entry(pipeline, prompt)
+    if "chunks" in entry:
+        return _replay_stream(entry)
+    if REPLAY_SPEED > 0:
+        time.sleep(entry["elapsed"] / REPLAY_SPEED)
+    if "error" in entry:
+        raise RuntimeError(entry["error"])
+    return entry["response"]
+
+
+# Iterator that records a streamed response. Only the time spent inside the provider's next()
+# is recorded, so the caller's own work between chunks (e.g. rendering) is not counted as latency.
+class _RecordedStream:
+    def __init__(self, entry, call_elapsed, stream):
+        self._entry = entry
+        self._call_elapsed = call_elapsed
+        self._stream = stream
+        self._chunks = []
+        self._chunk_delays = []
+        self._exhausted = False
+        self._written = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            chunk = next(self._stream)
+        except StopIteration:
+            self._exhausted = True
+            self._write()
+            raise
+        except Exception as e:
+            self._entry["error"] = f"{type(e).__name__}: {e}"
+            self._write()
+            raise
+        self._chunk_delays.append(time.perf_counter() - start)
+        self._chunks.append(chunk)
+        return chunk
+
+    def close(self):
+        self._stream.close()
+        self._write()
+
+    def __del__(self):
+        # Streams that are closed early or never iterated still reach the cassette.
+        self._write()
+
+    def _write(self):
+        if self._written:
+            return
+        self._written = True
+        self._entry["elapsed"] = self._call_elapsed + sum(self._chunk_delays)
+        self._entry["chunks"] = self._chunks
+        self._entry["chunk_delays"] = self._chunk_delays
+        self._entry["response"] = "".join(self._chunks)
+        if not self._exhausted and "error" not in self._entry:
+            self._entry["incomplete"] = True
+        _write_entry(self._entry)
+
+
+# Decorator that records or replays a provider call, keyed by its pipeline and prompt.
+def recorded(pipeline):
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if CASSETTE_MODE not in ("record", "replay"):
+                return func(*args, **kwargs)
+
+            arguments = signature.bind(*args, **kwargs).arguments
+            prompt = arguments["prompt"]
+
+            if CASSETTE_MODE == "replay":
+                return _replay(pipeline, prompt)
+
+            entry = {
+                "key": prompt_key(pipeline, prompt),
+                "pipeline": pipeline,
+                "function": func.__name__,
+                # API keys never go into the cassette.
+                "params": {name: value for name, value in arguments.items() if name != "prompt" and "key" not in name},
+                "prompt": prompt,
+                "recorded_at": time.time(),
+            }
+            start = time.perf_counter()
+            try:
+                response = func(*args, **kwargs)
+            except Exception as e:
+                entry["elapsed"] = time.perf_counter() - start
+                entry["error"] = f"{type(e).__name__}: {e}"
+                _write_entry(entry)
+                raise
+
+            if inspect.isgenerator(response):
+                return _RecordedStream(entry, time.perf_counter() - start, response)
+
+            entry["elapsed"] = time.perf_counter() - start
+            entry["response"] = response
+            _write_entry(entry)
+            return response
+
+        return wrapper
+    return decorator
+
+
+# Function to print a per-pipeline timing summary of a cassette.
+def summarize(path):
+    entries = load_cassette(path)
+    timings = defaultdict(list)
+    errors = defaultdict(int)
+    for entry in entries:
+        timings[entry["pipeline"]].append(entry["elapsed"])
+        if "error" in entry:
+            errors[entry["pipeline"]] += 1
+
+    print(f"{path}: {len(entries)} recorded calls")
+    for pipeline, elapsed in timings.items():
+        print(
+            f"  {pipeline}: {len(elapsed)} calls, {errors[pipeline]} errors, "
+            f"mean {sum(elapsed) / len(elapsed):.2f}s, max {max(elapsed):.2f}s, total {sum(elapsed):.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    summarize(sys.argv[1] if len(sys.argv) > 1 else CASSETTE_PATH)
@@ -3,6 +3,10 @@ import streamlit as st
 
 import google.generativeai as genai
 
+from cassette import recorded
+from hardware_profiles import get_hardware_context
+from ollama_client import chat
+
 
 # Function to convert JSON to Markdown for display.    
 def response_to_markdown(documentation, optimization_recommendations):
@@ -19,6 +23,7 @@ def response_to_markdown(documentation, optimization_recommendations):
 
 # Function to create a prompt for generating a threat model
 def create_code_model_prompt(language_type, hardware_name, input_text_app_desc, input_text_code):
+    hardware_context = get_hardware_context(hardware_name, language_type)
     prompt = f"""
     Act as a Senior Embedded Systems Architect and Code Generation Specialist with expertise in {language_type} and {hardware_name} development.
 
@@ -37,9 +42,14 @@ Input Parameters:
 - Specific Requirements: {input_text_app_desc}
 - Optional Code Context/Existing Fragments: {input_text_code}
 
+Hardware Profile (authoritative, do not restate it in the output):
+{hardware_context}
+
 Code Generation Methodology:
 1. Architecture Analysis
-- Carefully examine the hardware specifications
+- Carefully examine the hardware profile above
+- Keep code and data within the listed flash and RAM budget
+- Use the listed HAL/SDK, target and compiler flags
 - Identify hardware-specific limitations
 - Determine optimal memory management strategy
 - Assess real-time processing requirements
@@ -104,6 +114,7 @@ Output Format:
     return prompt
 
 # Function to get threat model from the GPT response.
+@recorded("code_model")
 def get_code_model(api_key, model_name, prompt):
     genai.configure(api_key=api_key)
     model = genai.GenerativeModel(
@@ -125,3 +136,21 @@ def get_code_model(api_key, model_name, prompt):
 
     return response_content
 
+# Function to get code model from an Ollama hosted LLM.
+@recorded("code_model")
+def get_code_model_ollama(ollama_model, prompt):
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant designed to output JSON."},
+        {"role": "user", "content": prompt},
+    ]
+    # Streamed under the hood so long generations are not cut off by a read timeout
+    response_text = chat(ollama_model, messages, "code_model", response_format="json")
+    try:
+        response_content = json.loads(response_text)
+    except json.JSONDecodeError as e:
+        print(f"Error decoding JSON: {str(e)}")
+        print("Raw JSON string:")
+        print(response_text)
+        return None
+
+    return response_content
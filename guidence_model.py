@@ -1,8 +1,13 @@
 import requests
 import google.generativeai as genai
 
+from cassette import recorded
+from hardware_profiles import get_hardware_context
+from ollama_client import stream_chat
+
 # Function to create a prompt to generate mitigating controls
 def create_guidence_prompt(code, language, hardware, app_desc):
+    hardware_context = get_hardware_context(hardware, language)
     prompt = f"""
 Act as an embedded systems development expert with extensive experience in embedded hardware and firmware design. Your task is to analyze the provided code and suggest **step-by-step guidance** for further development and improvement.
 
@@ -25,7 +30,7 @@ Below is the provided languge user is using:
 {language}
 
 Below is the provided hardware user is using:
-{hardware}
+{hardware_context}
 
 Below is the provided application description:
 {app_desc}
@@ -35,6 +40,7 @@ YOUR RESPONSE (do not wrap in a code block):
     return prompt
 
 
+@recorded("guidence")
 def get_guidence(api_key, model_name, prompt):
     genai.configure(api_key=api_key)
     model = genai.GenerativeModel(
@@ -54,3 +60,12 @@ def get_guidence(api_key, model_name, prompt):
         return None
 
     return gudience
+
+# Function to stream guidence from an Ollama hosted LLM, chunk by chunk.
+@recorded("guidence")
+def get_guidence_ollama(ollama_model, prompt):
+    messages = [
+        {"role": "system", "content": "You are helpful assistant your taks is to act as an embedded systems development expert with extensive experience in embedded hardware and firmware design. Your task is to analyze the provided code and suggest step-by-step guidance for further development and improvement in markdown format."},
+        {"role": "user", "content": prompt},
+    ]
+    return stream_chat(ollama_model, messages, "guidence")
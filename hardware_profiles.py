@@ -0,0 +1,63 @@
+import json
+import os
+
+# Path to the hardware profile registry. New boards are added to this file, not to the code.
+HARDWARE_PROFILES_PATH = os.getenv(
+    "HEXORCIST_HARDWARE_PROFILES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "hardware_profiles.json"),
+)
+
+
+# Function to build the compact prompt context block for one board and language.
+def build_hardware_context(profile, language):
+    lines = [
+        f"- Board: {profile['name']} ({profile['mcu']})",
+        f"- Clock: {profile['clock']}",
+        f"- Flash/Storage: {profile['flash']}",
+        f"- RAM: {profile['ram']}",
+        f"- Peripherals: {', '.join(profile['peripherals'])}",
+    ]
+
+    toolchain = profile.get("toolchains", {}).get(language)
+    if toolchain:
+        if toolchain.get("sdk"):
+            lines.append(f"- HAL/SDK: {', '.join(toolchain['sdk'])}")
+        lines.append(f"- Toolchain/Target: {toolchain['target']}")
+        if toolchain.get("flags"):
+            lines.append(f"- Compiler/Build Flags: {'; '.join(toolchain['flags'])}")
+    else:
+        lines.append(f"- Toolchain/Target: no {language} toolchain for this board")
+
+    if profile.get("notes"):
+        lines.append(f"- Notes: {profile['notes']}")
+
+    return "\n".join(lines)
+
+
+# Function to load the registry and precompute every board/language context block.
+def load_hardware_profiles(path=HARDWARE_PROFILES_PATH):
+    with open(path, encoding="utf-8") as f:
+        registry = json.load(f)
+
+    languages = registry["languages"]
+    profiles = {board["name"]: board for board in registry["boards"]}
+    contexts = {
+        (name, language): build_hardware_context(profile, language)
+        for name, profile in profiles.items()
+        for language in languages
+    }
+
+    return languages, profiles, contexts
+
+
+# Loaded once per process; Streamlit reruns reuse the imported module.
+LANGUAGES, HARDWARE_PROFILES, HARDWARE_CONTEXTS = load_hardware_profiles()
+
+
+# Function to get the precomputed context block for the selected board and language.
+def get_hardware_context(hardware_name, language):
+    context = HARDWARE_CONTEXTS.get((hardware_name, language))
+    if context is None:
+        # Unknown boards fall back to the bare name so prompts still render.
+        context = f"- Board: {hardware_name}"
+    return context
@@ -0,0 +1,435 @@
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tornado.websocket import websocket_connect
+
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.Selectbox_pb2 import Selectbox
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+# Load test for a single Hexorcist container. The app runs as a real `streamlit run main.py`
+# process, virtual users drive it over Streamlit's websocket protocol like a browser does,
+# and every model call goes to a mock Ollama server running in its own process.
+# CPU and RSS are sampled from the app process only.
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STEPS = ["load", "configure", "code_generation", "guidence", "test_cases"]
+
+MOCK_CODE_MODEL = {
+    "source_code": "fn main() {\n    loop {}\n}\n",
+    "documentation": "Mock documentation generated by the load test backend.",
+    "optimization_recommendations": ["Mock recommendation 1", "Mock recommendation 2"],
+}
+
+
+# Function to create a mock Ollama server that streams NDJSON responses with a configurable delay.
+def create_mock_ollama_server(first_token_delay, token_delay, tokens):
+    class MockOllamaHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            # A request without messages is the warm-up call
+            if not body.get("messages"):
+                self._write_line({"model": body.get("model"), "done": True})
+                self._end_stream()
+                return
+
+            if body.get("format") == "json":
+                text = json.dumps(MOCK_CODE_MODEL)
+                size = max(1, math.ceil(len(text) / tokens))
+                chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            else:
+                chunks = [f"mock token {i} " for i in range(tokens)]
+
+            time.sleep(first_token_delay)
+            for chunk in chunks:
+                self._write_line({"message": {"role": "assistant", "content": chunk}, "done": False})
+                time.sleep(token_delay)
+            self._write_line({"message": {"role": "assistant", "content": ""}, "done": True})
+            self._end_stream()
+
+        def _write_line(self, data):
+            line = (json.dumps(data) + "\n").encode("utf-8")
+            self.wfile.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+            self.wfile.flush()
+
+        def _end_stream(self):
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockOllamaHandler)
+    server.daemon_threads = True
+    return server
+
+
+# Function to run the mock Ollama server in its own process and report its port back.
+def serve_mock_ollama(port_queue, first_token_delay, token_delay, tokens):
+    server = create_mock_ollama_server(first_token_delay, token_delay, tokens)
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# Function to start `streamlit run main.py` against the mock backend and wait until it is healthy.
+def start_app_server(ollama_port, startup_timeout=60):
+    port = _free_port()
+    env = dict(os.environ, OLLAMA_HOST=f"http://127.0.0.1:{ollama_port}", OLLAMA_MODEL="mock")
+    env.pop("HEXORCIST_CASSETTE_MODE", None)
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", "main.py",
+            f"--server.port={port}", "--server.address=127.0.0.1", "--server.headless=true",
+            "--server.fileWatcherType=none", "--browser.gatherUsageStats=false",
+        ],
+        cwd=APP_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {process.returncode} during startup")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"streamlit did not become healthy within {startup_timeout}s")
+
+
+# Function to read the CPU time (seconds) and RSS (MB) of a process from /proc.
+def read_process_usage(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        # The process name may contain spaces, so split after its closing parenthesis
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    with open(f"/proc/{pid}/statm") as f:
+        rss_mb = int(f.read().split()[1]) * resource.getpagesize() / (1024 * 1024)
+    return cpu_seconds, rss_mb
+
+
+# Coroutine that samples CPU usage and RSS of the app process until cancelled.
+async def sample_resources(pid, interval, samples):
+    start = time.perf_counter()
+    last_wall, (last_cpu, _) = start, read_process_usage(pid)
+    while True:
+        await asyncio.sleep(interval)
+        wall, (cpu, rss_mb) = time.perf_counter(), read_process_usage(pid)
+        samples.append({
+            "t": round(wall - start, 2),
+            "cpu_percent": round(100 * (cpu - last_cpu) / (wall - last_wall), 1),
+            "rss_mb": round(rss_mb, 1),
+        })
+        last_wall, last_cpu = wall, cpu
+
+
+# A single browser-like session on the app's websocket.
+class StreamlitSession:
+    def __init__(self, port, timeout):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.timeout = timeout
+        self.connection = None
+        self.widgets = {}
+        self.widget_states = {}
+        self.errors = []
+
+    async def connect(self):
+        self.connection = await websocket_connect(self.url, subprotocols=["streamlit"])
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+    # Send a rerun with the current widget states and wait until the script has finished.
+    async def rerun(self, trigger_label=None):
+        back_msg = BackMsg()
+        client_state = back_msg.rerun_script
+        # Mark the oneof as set even when there are no widget states to send
+        client_state.SetInParent()
+        for widget_state in self.widget_states.values():
+            client_state.widget_states.widgets.add().CopyFrom(widget_state)
+        if trigger_label is not None:
+            trigger = client_state.widget_states.widgets.add()
+            trigger.id = self._widget(trigger_label).id
+            trigger.trigger_value = True
+
+        self.widgets = {}
+        self.errors = []
+        await self.connection.write_message(back_msg.SerializeToString(), binary=True)
+        try:
+            await asyncio.wait_for(self._read_until_finished(), self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"script run did not finish within {self.timeout}s") from None
+        if self.errors:
+            raise RuntimeError(self.errors[0])
+
+    def set_selectbox(self, label, value):
+        widget = self._widget(label)
+        state = self.widget_states.setdefault(widget.id, WidgetState(id=widget.id))
+        # Streamlit 1.40 sends the option index, newer versions send the option text
+        if "raw_value" in Selectbox.DESCRIPTOR.fields_by_name:
+            state.string_value = value
+        else:
+            state.int_value = list(widget.options).index(value)
+
+    def set_text(self, label, value):
+        widget = self._widget(label)
+        state = self.widget_states.setdefault(widget.id, WidgetState(id=widget.id))
+        state.string_value = value
+
+    def _widget(self, label):
+        if label not in self.widgets:
+            raise LookupError(f"Widget {label!r} not found")
+        return self.widgets[label]
+
+    async def _read_until_finished(self):
+        while True:
+            message = await self.connection.read_message()
+            if message is None:
+                raise ConnectionError("websocket closed by the server")
+            if isinstance(message, str):
+                continue
+
+            forward_msg = ForwardMsg()
+            forward_msg.ParseFromString(message)
+            message_type = forward_msg.WhichOneof("type")
+
+            if message_type == "delta" and forward_msg.delta.WhichOneof("type") == "new_element":
+                self._handle_element(forward_msg.delta.new_element)
+            elif message_type == "script_finished":
+                status = forward_msg.script_finished
+                if status == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("main.py failed to compile")
+                if status != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return
+
+    def _handle_element(self, element):
+        element_type = element.WhichOneof("type")
+        if element_type in ("button", "selectbox", "text_area", "text_input"):
+            widget = getattr(element, element_type)
+            self.widgets[widget.label] = widget
+        elif element_type == "alert" and element.alert.format == Alert.ERROR:
+            self.errors.append(element.alert.body)
+        elif element_type == "exception":
+            self.errors.append(f"{element.exception.type}: {element.exception.message}")
+
+
+# Coroutine that runs the Code Generation -> Guidence -> Test Cases flow once as one virtual user.
+async def run_user_flow(args, port, record):
+    session = StreamlitSession(port, args.timeout)
+
+    async def load():
+        await session.connect()
+        await session.rerun()
+
+    async def configure():
+        # The browser reruns once the provider is selected and the description is entered
+        session.set_selectbox("Select your preferred model provider:", "Ollama")
+        session.set_text("Describe the project use case and working", args.app_desc)
+        await session.rerun()
+
+    actions = [
+        ("load", load),
+        ("configure", configure),
+        ("code_generation", lambda: session.rerun("Generate Code")),
+        ("guidence", lambda: session.rerun("Get Guidence")),
+        ("test_cases", lambda: session.rerun("Generate Test Cases")),
+    ]
+    try:
+        for step, action in actions:
+            start = time.perf_counter()
+            try:
+                await action()
+            except Exception as e:
+                record(step, time.perf_counter() - start, f"{type(e).__name__}: {e}")
+                # Later steps depend on this one, so the rest of the flow is skipped
+                return
+            record(step, time.perf_counter() - start, None)
+            await asyncio.sleep(args.think_time)
+    finally:
+        session.close()
+
+
+# Function to compute a nearest-rank percentile.
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+# Coroutine that runs one load level with the given number of concurrent virtual users.
+async def run_load_level(args, port, pid, users):
+    # Latencies of successful steps only; failed attempts are counted separately so
+    # timeouts and instant connection errors don't skew the percentiles.
+    results = defaultdict(list)
+    errors = defaultdict(list)
+
+    def record(step, elapsed, error):
+        if error:
+            errors[step].append(error)
+        else:
+            results[step].append(elapsed)
+
+    async def virtual_user(delay):
+        await asyncio.sleep(delay)
+        for _ in range(args.iterations):
+            await run_user_flow(args, port, record)
+
+    samples = []
+    sampler = asyncio.create_task(sample_resources(pid, args.sample_interval, samples))
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user(i * args.ramp_up / users) for i in range(users)))
+    duration = time.perf_counter() - start
+    sampler.cancel()
+
+    steps = {}
+    for step in STEPS:
+        latencies = results.get(step, [])
+        attempts = len(latencies) + len(errors[step])
+        if not attempts:
+            continue
+        steps[step] = {
+            "count": attempts,
+            "errors": len(errors[step]),
+            "error_rate": len(errors[step]) / attempts,
+            "p50": percentile(latencies, 50) if latencies else None,
+            "p90": percentile(latencies, 90) if latencies else None,
+            "p95": percentile(latencies, 95) if latencies else None,
+            "p99": percentile(latencies, 99) if latencies else None,
+            "max": max(latencies) if latencies else None,
+            "sample_errors": sorted(set(errors[step]))[:3],
+        }
+
+    completed = steps.get("test_cases", {}).get("count", 0) - steps.get("test_cases", {}).get("errors", 0)
+    return {
+        "users": users,
+        "duration": duration,
+        "completed_flows": completed,
+        "flows_per_minute": 60 * completed / duration,
+        "steps": steps,
+        "resources": samples,
+    }
+
+
+# Coroutine that runs untimed flows so the first level doesn't include the server's first import of main.py.
+async def warm_up_app(args, port):
+    errors = []
+
+    def record(step, elapsed, error):
+        if error:
+            errors.append(f"{step}: {error}")
+
+    for _ in range(args.warmup):
+        await run_user_flow(args, port, record)
+    return errors
+
+
+# Function to print the report of one load level.
+def print_report(report, max_timeline_rows=20):
+    print(f"\n=== {report['users']} concurrent users: {report['duration']:.1f}s, "
+          f"{report['completed_flows']} flows completed ({report['flows_per_minute']:.1f}/min) ===")
+    print(f"{'step':<16}{'count':>7}{'errors':>8}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for step, stats in report["steps"].items():
+        latencies = "".join(
+            f"{stats[key]:>8.2f}s" if stats[key] is not None else f"{'-':>9}"
+            for key in ("p50", "p90", "p95", "p99", "max")
+        )
+        print(f"{step:<16}{stats['count']:>7}{stats['error_rate']:>8.1%}{latencies}")
+        for error in stats["sample_errors"]:
+            print(f"    ! {error}")
+
+    samples = report["resources"]
+    if samples:
+        cpu = [sample["cpu_percent"] for sample in samples]
+        rss = [sample["rss_mb"] for sample in samples]
+        print(f"App process CPU: mean {sum(cpu) / len(cpu):.0f}%, max {max(cpu):.0f}% | "
+              f"RSS: start {rss[0]:.0f} MB, max {max(rss):.0f} MB, end {rss[-1]:.0f} MB")
+        step = max(1, math.ceil(len(samples) / max_timeline_rows))
+        print(f"{'t':>8}{'cpu':>8}{'rss':>10}")
+        for sample in samples[::step]:
+            print(f"{sample['t']:>7.1f}s{sample['cpu_percent']:>7.0f}%{sample['rss_mb']:>7.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent Hexorcist users against a mock LLM backend.")
+    parser.add_argument("--users", default="1,2,4,8", help="Comma-separated concurrency levels to run in turn")
+    parser.add_argument("--iterations", type=int, default=3, help="Flows per virtual user at each level")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed flows to run before the first level")
+    parser.add_argument("--ramp-up", type=float, default=2.0, help="Seconds over which users are started")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Seconds a user waits between steps")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Timeout of a single script run in seconds")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Seconds between CPU/RSS samples")
+    parser.add_argument("--first-token-delay", type=float, default=0.5, help="Mock backend delay before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="Mock backend delay between tokens")
+    parser.add_argument("--tokens", type=int, default=200, help="Tokens streamed per mock response")
+    parser.add_argument("--app-desc", default="A sensor node that samples a temperature sensor over I2C and sends readings over UART.")
+    parser.add_argument("--json", help="Write the full report, including resource samples, to this file")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/stat"):
+        parser.error("CPU/RSS sampling reads /proc; run the load test on Linux, e.g. inside the Docker image")
+
+    port_queue = multiprocessing.Queue()
+    mock_server = multiprocessing.Process(
+        target=serve_mock_ollama,
+        args=(port_queue, args.first_token_delay, args.token_delay, args.tokens),
+        daemon=True,
+    )
+    mock_server.start()
+
+    reports = []
+    app_process = None
+    try:
+        app_process, port = start_app_server(port_queue.get(timeout=10))
+        warmup_errors = asyncio.run(warm_up_app(args, port))
+        if warmup_errors:
+            print(f"Warning: warm-up flow failed: {warmup_errors[0]}")
+        for users in [int(level) for level in args.users.split(",")]:
+            report = asyncio.run(run_load_level(args, port, app_process.pid, users))
+            print_report(report)
+            reports.append(report)
+    finally:
+        if app_process is not None:
+            app_process.terminate()
+            app_process.wait()
+        mock_server.terminate()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
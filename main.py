@@ -8,8 +8,10 @@ from collections import defaultdict
 import os
 from dotenv import load_dotenv
 
-from code_model import create_code_model_prompt, get_code_model, response_to_markdown
-from guidence_model import create_guidence_prompt, get_guidence
+from code_model import create_code_model_prompt, get_code_model, get_code_model_ollama, response_to_markdown
+from guidence_model import create_guidence_prompt, get_guidence, get_guidence_ollama
+from hardware_profiles import LANGUAGES, HARDWARE_PROFILES
+from ollama_client import warm_up
 from test_cases import create_test_cases_prompt, get_test_cases, get_test_cases_azure, get_test_cases_google, get_test_cases_mistral, get_test_cases_ollama, get_test_cases_anthropic
 
 # ------------------ Helper Functions ------------------ #
@@ -50,6 +52,22 @@ def load_env_variables():
 # Call this function at the start of your app
 load_env_variables()
 
+# Load the Ollama model once per process and model name, so the first request skips the model load.
+# Failures raise, so they are not cached and a later session can try again.
+@st.cache_resource(show_spinner="Loading the local model...")
+def warm_up_ollama(ollama_model):
+    return warm_up(ollama_model)
+
+# Function to preload an Ollama model, remembering failures for this session so reruns don't retry them
+def preload_ollama_model(ollama_model):
+    warm_up_errors = st.session_state.setdefault('ollama_warm_up_errors', {})
+    if ollama_model not in warm_up_errors:
+        try:
+            warm_up_ollama(ollama_model)
+        except requests.RequestException as e:
+            warm_up_errors[ollama_model] = str(e)
+    return warm_up_errors.get(ollama_model)
+
 # ------------------ Streamlit UI Configuration ------------------ #
 
 st.set_page_config(
@@ -59,6 +77,10 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# Preload the configured local model when the app starts, before anyone selects Ollama
+if os.getenv('OLLAMA_MODEL'):
+    preload_ollama_model(os.getenv('OLLAMA_MODEL'))
+
 # ------------------ Sidebar ------------------ #
 
 st.sidebar.image("hexorcistLogo.webp")
@@ -66,18 +88,33 @@ st.sidebar.header("How to use Hexorcist")
 
 
 with st.sidebar:
-    model_provider = "Google AI API"
-    
-    if model_provider == "Google AI API":
-        st.markdown(
-        """
+    model_provider = st.selectbox(
+        label="Select your preferred model provider:",
+        options=["Google AI API", "Ollama"],
+        key="model_provider",
+        help="Use Ollama to run local models without any external service.",
+    )
+
+    st.markdown(
+    """
     1. Provide details of the application that you would like to get code of  📝
     2. Generate a code for your application with instructions to build and run along with performance optimizations 🚀
     """
     )
 
-        # Add model selection input field to the sidebar
-        google_model = "gemini-1.5-flash"
+    # Add model selection input field to the sidebar
+    google_model = "gemini-1.5-flash"
+
+    if model_provider == "Ollama":
+        ollama_model = st.text_input(
+            label="Enter the name of the Ollama model:",
+            value=os.getenv('OLLAMA_MODEL', 'llama3.1'),
+            key="ollama_model",
+            help="The model must already be pulled on the Ollama server, e.g. with `ollama pull llama3.1`.",
+        )
+        warm_up_error = preload_ollama_model(ollama_model)
+        if warm_up_error:
+            st.warning(f"Could not preload the Ollama model, the first request may be slow: {warm_up_error}")
 
     st.markdown("""---""")
     google_api_key = st.session_state.get('google_api_key', '')
@@ -197,33 +234,13 @@ Generate code and documentation and performance optimizations for your applicati
     with col2:
             language_type = st.selectbox(
                 label="Select the language of the application",
-                options=[
-                    "Rust",
-                    "C",
-                    "C++",
-                    "Assembly",
-                    "VHDL",
-                ],
+                options=LANGUAGES,
                 key="app_type",
             )
 
             hardware_name = st.selectbox(
                 label="Select the hardware you are using?",
-                options=[
-                    "Arduino Uno",
-                    "Arduino Nano",
-                    "Arduino Mega",
-                    "ESP32",
-                    "ESP8266",
-                    "STM32",
-                    "ATmega328P (AVR)",
-                    "PIC Microcontrollers (Microchip)",
-                    "TI MSP430",
-                    "Raspberry Pi 4",
-                    "Raspberry Pi Zero",
-                    "BeagleBone Black",
-                    "Xilinx Zynq"
-                ],
+                options=list(HARDWARE_PROFILES),
                 key="hardware_type",
             )
 
@@ -246,7 +263,10 @@ Generate code and documentation and performance optimizations for your applicati
             while retry_count < max_retries:
                 try:
                    
-                    model_output = get_code_model(google_api_key, google_model, code_model_prompt)
+                    if model_provider == "Ollama":
+                        model_output = get_code_model_ollama(ollama_model, code_model_prompt)
+                    else:
+                        model_output = get_code_model(google_api_key, google_model, code_model_prompt)
                    
 
                     # Access the threat model and improvement suggestions from the parsed content
@@ -316,14 +336,21 @@ Development Guidence techniques, and additional resources to help you improve an
             with st.spinner("Generating Guidence..."):
                 max_retries = 3
                 retry_count = 0
+                # Placeholder for the output, cleared on retry so a failed stream's partial text does not stay on the page
+                guidence_placeholder = st.empty()
                 while retry_count < max_retries:
                     try:
                         # Call the relevant get_guidence function with the generated prompt
-                        guidence_markdown = get_guidence(google_api_key, google_model, guidence_prompt)
-                        # Display the suggested guidence in Markdown
-                        st.markdown(guidence_markdown)
+                        if model_provider == "Ollama":
+                            # Stream the local model's output token by token
+                            guidence_markdown = guidence_placeholder.container().write_stream(get_guidence_ollama(ollama_model, guidence_prompt))
+                        else:
+                            guidence_markdown = get_guidence(google_api_key, google_model, guidence_prompt)
+                            # Display the suggested guidence in Markdown
+                            guidence_placeholder.markdown(guidence_markdown)
                         break  # Exit the loop if successful
                     except Exception as e:
+                        guidence_placeholder.empty()
                         retry_count += 1
                         if retry_count == max_retries:
                             st.error(f"Error suggesting guidence after {max_retries} attempts: {e}")
@@ -370,15 +397,22 @@ test cases tailored to your application's requirements and threat scenarios.
             with st.spinner("Generating Test Cases..."):
                 max_retries = 3
                 retry_count = 0
+                # Placeholder for the output, cleared on retry so a failed stream's partial text does not stay on the page
+                test_cases_placeholder = st.empty()
                 while retry_count < max_retries:
                     try:
                         # Call the relevant get_test_cases function with the generated prompt
-                        test_cases_markdown = get_test_cases(google_api_key, google_model, test_cases_prompt)
-                        
-                        # Display the generated test cases in Markdown
-                        st.markdown(test_cases_markdown)
+                        if model_provider == "Ollama":
+                            # Stream the local model's output token by token
+                            test_cases_markdown = test_cases_placeholder.container().write_stream(get_test_cases_ollama(ollama_model, test_cases_prompt))
+                        else:
+                            test_cases_markdown = get_test_cases(google_api_key, google_model, test_cases_prompt)
+
+                            # Display the generated test cases in Markdown
+                            test_cases_placeholder.markdown(test_cases_markdown)
                         break  # Exit the loop if successful
                     except Exception as e:
+                        test_cases_placeholder.empty()
                         retry_count += 1
                         if retry_count == max_retries:
                             st.error(f"Error generating test cases after {max_retries} attempts: {e}")
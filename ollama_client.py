@@ -0,0 +1,89 @@
+import json
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Context window and output length per pipeline. Override with e.g. OLLAMA_CODE_MODEL_NUM_CTX=16384.
+PIPELINE_OPTIONS = {
+    "code_model": {"num_ctx": 8192, "num_predict": 4096},
+    "guidence": {"num_ctx": 8192, "num_predict": 2048},
+    "test_cases": {"num_ctx": 8192, "num_predict": 2048},
+}
+
+# One pooled session per process, shared by all Streamlit sessions.
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
+
+# Function to get the Ollama server settings. Read per request, so values loaded from .env
+# after this module is imported still apply. OLLAMA_KEEP_ALIVE keeps the model loaded between requests.
+def get_ollama_settings():
+    return {
+        "host": os.getenv("OLLAMA_HOST", "http://localhost:11434").rstrip("/"),
+        "keep_alive": os.getenv("OLLAMA_KEEP_ALIVE", "30m"),
+        "timeout": float(os.getenv("OLLAMA_TIMEOUT", "600")),
+    }
+
+
+# Function to get the Ollama options of a pipeline, including environment overrides.
+def get_pipeline_options(pipeline):
+    options = dict(PIPELINE_OPTIONS.get(pipeline, {}))
+    for option in ("num_ctx", "num_predict"):
+        value = os.getenv(f"OLLAMA_{pipeline.upper()}_{option.upper()}")
+        if value:
+            options[option] = int(value)
+    return options
+
+
+# Function to stream a chat response from Ollama, yielding the text chunk by chunk.
+def stream_chat(ollama_model, messages, pipeline, response_format=None):
+    settings = get_ollama_settings()
+    data = {
+        "model": ollama_model,
+        "messages": messages,
+        "stream": True,
+        "keep_alive": settings["keep_alive"],
+        "options": get_pipeline_options(pipeline),
+    }
+    if response_format:
+        data["format"] = response_format
+
+    with _session.post(f"{settings['host']}/api/chat", json=data, stream=True, timeout=(5, settings["timeout"])) as response:
+        response.raise_for_status()
+        # Ollama streams newline-delimited JSON objects, the last one has "done": true.
+        # Read to the end of the body so the connection goes back to the pool.
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if "error" in chunk:
+                raise RuntimeError(f"Ollama error: {chunk['error']}")
+            content = chunk.get("message", {}).get("content", "")
+            if content:
+                yield content
+
+
+# Function to get a complete chat response from Ollama.
+def chat(ollama_model, messages, pipeline, response_format=None):
+    return "".join(stream_chat(ollama_model, messages, pipeline, response_format))
+
+
+# Function to load the model into memory so the first real request does not pay the load time.
+def warm_up(ollama_model, pipeline="code_model"):
+    settings = get_ollama_settings()
+    # A chat request without messages only loads the model. Ollama reloads the model when
+    # num_ctx changes, so load it with the context window the first pipeline will ask for.
+    response = _session.post(
+        f"{settings['host']}/api/chat",
+        json={
+            "model": ollama_model,
+            "messages": [],
+            "keep_alive": settings["keep_alive"],
+            "options": {"num_ctx": get_pipeline_options(pipeline)["num_ctx"]},
+        },
+        timeout=(5, settings["timeout"]),
+    )
+    response.raise_for_status()
+    return response.json()
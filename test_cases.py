@@ -1,21 +1,27 @@
-import requests
 from anthropic import Anthropic
 from mistralai import Mistral
 from openai import OpenAI, AzureOpenAI
 
 import google.generativeai as genai
 
+from cassette import recorded
+from hardware_profiles import get_hardware_context
+from ollama_client import stream_chat
+
 # Function to create a prompt to generate mitigating controls
 def create_test_cases_prompt(code, language, hardware, application_description):
+    hardware_context = get_hardware_context(hardware, language)
     prompt =f"""
 Act as an expert in embedded systems development and testing with more than 20 years of experience. 
 Your task is to generate test cases for running embedded application code in order to identify potential issues such as 
 memory allocation errors, CPU utilization problems, system crashes, or other runtime errors. The test cases should 
 focus on verifying the stability and efficiency of the embedded system. Give the test cases in language specific test framework.
+Keep the test harness itself within the memory budget of the hardware described below.
 
 ### Application Details:
 - **Programming Language:** {language}
-- **Hardware/Platform:** {hardware}
+- **Hardware/Platform:**
+{hardware_context}
 - **Application Code:** {code}
 - **Application Description:** {application_description}
 
@@ -35,6 +41,7 @@ YOUR RESPONSE (do not add introductory text, just provide the test cases):
 
 
 # Function to get test cases from the GPT response.
+@recorded("test_cases")
 def get_test_cases(api_key, model_name, prompt):
     genai.configure(api_key=api_key)
     model = genai.GenerativeModel(
@@ -49,6 +56,7 @@ def get_test_cases(api_key, model_name, prompt):
     return test_cases
 
 # Function to get mitigations from the Azure OpenAI response.
+@recorded("test_cases")
 def get_test_cases_azure(azure_api_endpoint, azure_api_key, azure_api_version, azure_deployment_name, prompt):
     client = AzureOpenAI(
         azure_endpoint = azure_api_endpoint,
@@ -70,6 +78,7 @@ def get_test_cases_azure(azure_api_endpoint, azure_api_key, azure_api_version, a
     return test_cases
 
 # Function to get test cases from the Google model's response.
+@recorded("test_cases")
 def get_test_cases_google(google_api_key, google_model, prompt):
     genai.configure(api_key=google_api_key)
     model = genai.GenerativeModel(
@@ -84,6 +93,7 @@ def get_test_cases_google(google_api_key, google_model, prompt):
     return test_cases
 
 # Function to get test cases from the Mistral model's response.
+@recorded("test_cases")
 def get_test_cases_mistral(mistral_api_key, mistral_model, prompt):
     client = Mistral(api_key=mistral_api_key)
 
@@ -100,34 +110,17 @@ def get_test_cases_mistral(mistral_api_key, mistral_model, prompt):
 
     return test_cases
 
-# Function to get test cases from Ollama hosted LLM.
+# Function to stream test cases from an Ollama hosted LLM, chunk by chunk.
+@recorded("test_cases")
 def get_test_cases_ollama(ollama_model, prompt):
-    
-    url = "http://localhost:11434/api/chat"
-
-    data = {
-        "model": ollama_model,
-        "stream": False,
-        "messages": [
-            {
-                "role": "system", 
-                "content": "You are a helpful assistant that provides Gherkin test cases in Markdown format."},
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ]
-    }
-    response = requests.post(url, json=data)
-
-    outer_json = response.json()
-    
-    # Access the 'content' attribute of the 'message' dictionary
-    mitigations = outer_json["message"]["content"]
-
-    return mitigations
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant that provides Gherkin test cases in Markdown format."},
+        {"role": "user", "content": prompt},
+    ]
+    return stream_chat(ollama_model, messages, "test_cases")
 
 # Function to get test cases from the Anthropic model's response.
+@recorded("test_cases")
 def get_test_cases_anthropic(anthropic_api_key, anthropic_model, prompt):
     client = Anthropic(api_key=anthropic_api_key)
     response = client.messages.create(